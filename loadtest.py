@@ -0,0 +1,356 @@
+"""
+Local load-testing harness for the Hangman web API
+Simulated players start games, guess with random think times, use hints and
+finish, while per-endpoint latencies and leaderboard writes are recorded
+
+Usage:
+    python loadtest.py --players 50 --games 20
+    python loadtest.py --players 50 --processes 4
+    python loadtest.py --players 200 --url http://127.0.0.1:8000 --timing-log /tmp/lb-timing.log
+
+In-process runs use a scratch leaderboard file. With --processes N, N harness
+processes each run their own copy of the app against the same scratch
+leaderboard, so leaderboard writes contend across processes as they do
+between gunicorn workers.
+
+Against a real server (--url), start it with a scratch leaderboard and a
+timing log, otherwise the run changes the server's real leaderboard.json:
+    HANGMAN_LEADERBOARD_FILE=/tmp/lb.json \
+    HANGMAN_LEADERBOARD_TIMING_LOG=/tmp/lb-timing.log \
+    gunicorn -w 4 main:app
+Games live in the memory of the worker that created them, so with more than
+one worker the server needs sticky routing (or -w 1); otherwise follow-up
+requests land on other workers and return 404.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import sessions
+
+# Rough English letter frequency, used as the simulated guessing order
+GUESS_ORDER = "ETAOINSRHLDCUMFPGWYBVKXJQZ"
+
+
+class LatencyRecorder:
+    """Thread-safe collection of timings grouped by name"""
+
+    def __init__(self):
+        self._timings = {}
+        self._errors = {}
+        self._not_found = 0
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, ok=True, not_found=False):
+        with self._lock:
+            self._timings.setdefault(name, []).append(seconds)
+            if not ok:
+                self._errors[name] = self._errors.get(name, 0) + 1
+            if not_found:
+                self._not_found += 1
+
+    @property
+    def not_found(self):
+        with self._lock:
+            return self._not_found
+
+    def export(self):
+        """Raw timings and error counts, for merging across processes"""
+        with self._lock:
+            return {
+                "timings": {name: list(values) for name, values in self._timings.items()},
+                "errors": dict(self._errors),
+                "not_found": self._not_found,
+            }
+
+    def merge(self, exported):
+        with self._lock:
+            for name, values in exported["timings"].items():
+                self._timings.setdefault(name, []).extend(values)
+            for name, count in exported["errors"].items():
+                self._errors[name] = self._errors.get(name, 0) + count
+            self._not_found += exported["not_found"]
+
+    def report(self, elapsed):
+        """Summary rows of count, throughput and latency percentiles"""
+        with self._lock:
+            timings = {name: sorted(values) for name, values in self._timings.items()}
+            errors = dict(self._errors)
+
+        rows = []
+        for name, values in sorted(timings.items()):
+            rows.append({
+                "name": name,
+                "count": len(values),
+                "errors": errors.get(name, 0),
+                "per_second": len(values) / elapsed if elapsed else 0.0,
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+                "max_ms": values[-1] * 1000,
+            })
+        return rows
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def read_timing_log(path, offset, recorder):
+    """
+    Add leaderboard timings written by the app after offset.
+    Returns the set of process ids that wrote the leaderboard.
+    """
+    writers = set()
+    try:
+        with open(path, 'r') as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    _, pid, wait, write = line.split()
+                    wait, write = float(wait), float(write)
+                except ValueError:
+                    continue
+                writers.add(pid)
+                recorder.record("leaderboard_wait", wait)
+                recorder.record("leaderboard_write", write)
+                recorder.record("leaderboard_update", wait + write)
+    except FileNotFoundError:
+        pass
+    return writers
+
+
+def _log_size(path):
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+class InProcessClient:
+    """Calls the Flask app directly through its test client"""
+
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def post(self, path, payload=None):
+        response = self._client.post(path, json=payload or {})
+        return response.status_code, response.get_json()
+
+
+class HttpClient:
+    """Calls a running server (e.g. gunicorn) over HTTP"""
+
+    def __init__(self, base_url):
+        self._base_url = base_url.rstrip("/")
+
+    def post(self, path, payload=None):
+        request = urllib.request.Request(
+            self._base_url + path,
+            data=json.dumps(payload or {}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+
+class SimulatedPlayer:
+    """Plays a number of games with human-like pauses between actions"""
+
+    def __init__(self, client, recorder, rng, options):
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.options = options
+
+    def think(self):
+        """Sleep for a log-normally distributed think time"""
+        median = self.options.think_median
+        if median > 0:
+            time.sleep(self.rng.lognormvariate(0, self.options.think_sigma) * median)
+
+    def call(self, name, path, payload=None):
+        start = time.perf_counter()
+        try:
+            status, body = self.client.post(path, payload)
+        except Exception:
+            status, body = None, None
+        self.recorder.record(
+            name,
+            time.perf_counter() - start,
+            ok=status is not None and status < 400,
+            not_found=status == 404 and name != "start",
+        )
+        # Error bodies (e.g. {"error": ...}) are treated like no response at all
+        if status is None or status >= 400:
+            return None
+        return body
+
+    def play_game(self):
+        body = self.call("start", "/api/games", {
+            "language": self.options.language,
+            "difficulty": self.options.difficulty,
+        })
+        if not body:
+            return
+        game_path = f"/api/games/{body['game_id']}"
+
+        # Mostly frequency order, shuffled a little so players differ
+        letters = list(GUESS_ORDER)
+        for i in range(len(letters) - 1):
+            if self.rng.random() < 0.3:
+                letters[i], letters[i + 1] = letters[i + 1], letters[i]
+
+        state = body
+        while state.get("game_active") and letters:
+            self.think()
+            if self.rng.random() < self.options.batch_rate:
+                steps, letters = letters[:self.options.batch_size], letters[self.options.batch_size:]
+                body = self.call("batch", game_path + "/batch", {"steps": steps})
+            elif state.get("hints_remaining") and self.rng.random() < self.options.hint_rate:
+                body = self.call("hint", game_path + "/hint")
+            else:
+                body = self.call("guess", game_path + "/guess", {"letter": letters.pop(0)})
+            if not body:
+                return
+            state = body["state"]
+
+    def run(self, deadline):
+        for _ in range(self.options.games):
+            if time.monotonic() >= deadline:
+                break
+            self.play_game()
+
+
+def _run_players(options, make_client, recorder, seed):
+    rng = random.Random(seed)
+    players = [
+        SimulatedPlayer(make_client(), recorder, random.Random(rng.random()), options)
+        for _ in range(options.players)
+    ]
+    deadline = time.monotonic() + options.duration if options.duration else float("inf")
+    threads = [threading.Thread(target=player.run, args=(deadline,)) for player in players]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def _run_in_process(options, leaderboard_file, timing_log, seed):
+    """Run one process worth of players against a local copy of the app"""
+    sessions.LEADERBOARD_FILE = leaderboard_file
+    sessions.LEADERBOARD_TIMING_LOG = timing_log
+    from main import app
+
+    recorder = LatencyRecorder()
+    _run_players(options, lambda: InProcessClient(app), recorder, seed)
+    return recorder.export()
+
+
+def run_load_test(options):
+    """
+    Run the simulated players and return (elapsed seconds, report rows, notes)
+    where notes are warnings about the run worth printing
+    """
+    recorder = LatencyRecorder()
+    notes = []
+    seeds = random.Random(options.seed)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if options.url:
+            timing_log = options.timing_log
+            if not timing_log:
+                notes.append("No --timing-log given: leaderboard write timings are not available")
+            notes.append("--url runs write to the server's leaderboard; start it with HANGMAN_LEADERBOARD_FILE pointing at a scratch file")
+        else:
+            timing_log = os.path.join(temp_dir, 'leaderboard-timing.log')
+        offset = _log_size(timing_log) if timing_log else 0
+
+        start = time.monotonic()
+        if options.url:
+            _run_players(options, lambda: HttpClient(options.url), recorder, seeds.random())
+        elif options.processes > 1:
+            leaderboard_file = os.path.join(temp_dir, 'leaderboard.json')
+            args = [(options, leaderboard_file, timing_log, seeds.random()) for _ in range(options.processes)]
+            with multiprocessing.get_context("spawn").Pool(options.processes) as pool:
+                for exported in pool.starmap(_run_in_process, args):
+                    recorder.merge(exported)
+        else:
+            # Keep simulated games out of the real leaderboard
+            leaderboard_file = sessions.LEADERBOARD_FILE
+            timing_file = sessions.LEADERBOARD_TIMING_LOG
+            try:
+                recorder.merge(_run_in_process(
+                    options, os.path.join(temp_dir, 'leaderboard.json'), timing_log, seeds.random()))
+            finally:
+                sessions.LEADERBOARD_FILE = leaderboard_file
+                sessions.LEADERBOARD_TIMING_LOG = timing_file
+        elapsed = time.monotonic() - start
+
+        if timing_log:
+            writers = read_timing_log(timing_log, offset, recorder)
+            if writers:
+                notes.append(f"Leaderboard written by {len(writers)} process(es)")
+
+    if recorder.not_found:
+        notes.append(
+            f"{recorder.not_found} follow-up requests returned 404: games are held in the worker "
+            "that created them, so multi-worker servers need sticky routing (or -w 1)"
+        )
+    return elapsed, recorder.report(elapsed), notes
+
+
+def print_report(elapsed, rows, notes=()):
+    print(f"Elapsed: {elapsed:.2f}s")
+    print(f"{'name':<20}{'count':>8}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for row in rows:
+        print(
+            f"{row['name']:<20}{row['count']:>8}{row['errors']:>8}{row['per_second']:>10.1f}"
+            f"{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}{row['max_ms']:>10.2f}"
+        )
+    for note in notes:
+        print(f"Note: {note}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Hangman web API")
+    parser.add_argument("--players", type=int, default=20, help="concurrent simulated players per process")
+    parser.add_argument("--processes", type=int, default=1, help="in-process harness processes sharing one leaderboard")
+    parser.add_argument("--games", type=int, default=10, help="games per player")
+    parser.add_argument("--duration", type=float, default=0, help="stop starting games after N seconds (0 = no limit)")
+    parser.add_argument("--think-median", type=float, default=0.05, help="median think time in seconds")
+    parser.add_argument("--think-sigma", type=float, default=0.6, help="spread of the log-normal think time")
+    parser.add_argument("--hint-rate", type=float, default=0.1, help="chance of using a hint instead of guessing")
+    parser.add_argument("--batch-rate", type=float, default=0.0, help="chance of sending a batch of guesses")
+    parser.add_argument("--batch-size", type=int, default=5, help="guesses per batch request")
+    parser.add_argument("--language", default="English")
+    parser.add_argument("--difficulty", default="Medium")
+    parser.add_argument("--url", help="base URL of a running server; defaults to the in-process app")
+    parser.add_argument("--timing-log", help="HANGMAN_LEADERBOARD_TIMING_LOG path of the server under --url")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    print_report(*run_load_test(options))
+
+
+if __name__ == "__main__":
+    main()
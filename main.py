@@ -12,6 +12,10 @@ import math
 import array
 import flask
 from words import get_words, WORD_BANKS
+from sessions import GameSession, SessionStore
+from snapshots import install_snapshot_hooks
+from word_index import get_index, load_dictionaries_from_env
+from tournament import Tournament, TournamentStore
 
 # Try to import optional libraries
 try:
@@ -681,6 +685,223 @@ class HangmanGame:
         ).pack(pady=10)
 
 
+game_sessions = SessionStore()
+install_snapshot_hooks(game_sessions)
+MAX_BATCH_STEPS = 64
+
+
+def _abort_json(message, status):
+    flask.abort(flask.make_response(flask.jsonify({"error": message}), status))
+
+
+def _json_object():
+    """Request body as a dict; a missing body counts as {}, anything but an object is a 400"""
+    data = flask.request.get_json(silent=True)
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        _abort_json("request body must be a JSON object", 400)
+    return data
+
+
+def _word_bank_or_400(data):
+    """Language and difficulty from a request body, checked against WORD_BANKS"""
+    language = data.get("language", "English")
+    difficulty = data.get("difficulty", "Medium")
+    if not (isinstance(language, str) and language in WORD_BANKS):
+        _abort_json(f"unknown language {language!r}", 400)
+    if not (isinstance(difficulty, str) and difficulty in WORD_BANKS[language]):
+        _abort_json(f"unknown difficulty {difficulty!r}", 400)
+    return language, difficulty
+
+
+def _get_session_or_404(session_id):
+    session = game_sessions.get(session_id)
+    if session is None:
+        _abort_json("unknown game", 404)
+    return session
+
+
+@app.route('/api/games', methods=['POST'])
+def api_new_game():
+    """Start a headless game and return its id"""
+    language, difficulty = _word_bank_or_400(_json_object())
+    session = GameSession.new_random(language, difficulty)
+    session_id = game_sessions.create(session)
+    return flask.jsonify({"game_id": session_id, **session.to_dict()}), 201
+
+
+@app.route('/api/games/<session_id>', methods=['GET'])
+def api_game_state(session_id):
+    """Return the current state of a game"""
+    session = _get_session_or_404(session_id)
+    return flask.jsonify(session.to_dict())
+
+
+@app.route('/api/games/<session_id>/guess', methods=['POST'])
+def api_guess(session_id):
+    """Guess a single letter"""
+    session = _get_session_or_404(session_id)
+    data = _json_object()
+    with session.lock:
+        result = session.guess(data.get("letter", ""))
+    game_sessions.finish(session)
+    return flask.jsonify({"result": result, "state": session.to_dict()})
+
+
+@app.route('/api/games/<session_id>/hint', methods=['POST'])
+def api_hint(session_id):
+    """Reveal a random unguessed letter"""
+    session = _get_session_or_404(session_id)
+    with session.lock:
+        result = session.hint()
+    game_sessions.finish(session)
+    return flask.jsonify({"result": result, "state": session.to_dict()})
+
+
+@app.route('/api/games/<session_id>/batch', methods=['POST'])
+def api_batch(session_id):
+    """
+    Apply an ordered list of guesses and hints in one request.
+    Body: {"steps": ["E", {"guess": "A"}, {"hint": true}, ...]}
+    Processing stops at game over; the leaderboard is written at most once.
+    """
+    session = _get_session_or_404(session_id)
+    steps = _json_object().get("steps")
+    if not isinstance(steps, list):
+        return flask.jsonify({"error": "steps must be a list"}), 400
+    if len(steps) > MAX_BATCH_STEPS:
+        return flask.jsonify({"error": f"at most {MAX_BATCH_STEPS} steps per batch"}), 400
+
+    with session.lock:
+        results = session.apply_steps(steps)
+    game_sessions.finish(session)
+    return flask.jsonify({
+        "results": results,
+        "steps_applied": len(results),
+        "state": session.to_dict(),
+    })
+
+
+tournaments = TournamentStore()
+MAX_STANDINGS_TOP = 100
+MAX_PLAYER_NAME = 64
+
+
+def _get_tournament_or_404(tournament_id):
+    tournament = tournaments.get(tournament_id)
+    if tournament is None:
+        _abort_json("unknown tournament", 404)
+    return tournament
+
+
+@app.route('/api/tournaments', methods=['POST'])
+def api_new_tournament():
+    """Create a tournament with a shared word sequence"""
+    data = _json_object()
+    language, difficulty = _word_bank_or_400(data)
+    try:
+        duration = data.get("duration")
+        tournament = Tournament(
+            language=language,
+            difficulty=difficulty,
+            rounds=int(data.get("rounds", 5)),
+            time_limit=float(data.get("time_limit", 120)),
+            duration=None if duration is None else float(duration),
+        )
+    except (TypeError, ValueError) as e:
+        return flask.jsonify({"error": f"invalid tournament settings: {e}"}), 400
+    tournament_id = tournaments.create(tournament)
+    return flask.jsonify({"tournament_id": tournament_id, "rounds": len(tournament.words)}), 201
+
+
+@app.route('/api/tournaments/<tournament_id>/players', methods=['POST'])
+def api_join_tournament(tournament_id):
+    """Join a tournament under a player name"""
+    tournament = _get_tournament_or_404(tournament_id)
+    name = _json_object().get("player", "")
+    if not isinstance(name, str) or not name or len(name) > MAX_PLAYER_NAME:
+        return flask.jsonify({"error": f"player must be a name of 1 to {MAX_PLAYER_NAME} characters"}), 400
+    try:
+        tournament.join(name)
+    except ValueError as e:
+        return flask.jsonify({"error": str(e)}), 409
+    return flask.jsonify(tournament.player_status(name)), 201
+
+
+@app.route('/api/tournaments/<tournament_id>/players/<name>/next', methods=['POST'])
+def api_next_tournament_word(tournament_id, name):
+    """
+    Start the player's next word. The returned game is played through the
+    normal guess/hint/batch endpoints and is scored when it finishes.
+    """
+    tournament = _get_tournament_or_404(tournament_id)
+    try:
+        session = tournament.start_round(name)
+    except KeyError:
+        return flask.jsonify({"error": "unknown player"}), 404
+    except ValueError as e:
+        return flask.jsonify({"error": str(e)}), 409
+    session_id = game_sessions.create(session)
+    return flask.jsonify({"game_id": session_id, **session.to_dict()}), 201
+
+
+@app.route('/api/tournaments/<tournament_id>/players/<name>', methods=['GET'])
+def api_tournament_player(tournament_id, name):
+    """A player's progress and current rank"""
+    tournament = _get_tournament_or_404(tournament_id)
+    if name not in tournament.players:
+        return flask.jsonify({"error": "unknown player"}), 404
+    return flask.jsonify(tournament.player_status(name))
+
+
+@app.route('/api/tournaments/<tournament_id>/standings', methods=['GET'])
+def api_tournament_standings(tournament_id):
+    """Top-N board, readable at any moment during the event"""
+    tournament = _get_tournament_or_404(tournament_id)
+    try:
+        top = int(flask.request.args.get("top", 10))
+    except ValueError:
+        return flask.jsonify({"error": "top must be an integer"}), 400
+    if not 1 <= top <= MAX_STANDINGS_TOP:
+        return flask.jsonify({"error": f"top must be between 1 and {MAX_STANDINGS_TOP}"}), 400
+    return flask.jsonify({"players": len(tournament.players), "standings": tournament.leaderboard(top)})
+
+
+load_dictionaries_from_env()
+DEFAULT_MATCH_LIMIT = 100
+MAX_MATCH_LIMIT = 1000
+
+
+@app.route('/api/words/match', methods=['GET'])
+def api_match_words():
+    """
+    List words matching a positional pattern; count is the total number of
+    matches even when words is cut off at limit.
+    Query: ?pattern=_A__A_&exclude=ET&language=English&reveal_all=1&limit=100
+    language may also name a dictionary registered with word_index.load_dictionary.
+    """
+    pattern = flask.request.args.get("pattern", "")
+    if not pattern:
+        return flask.jsonify({"error": "pattern is required"}), 400
+    exclude = flask.request.args.get("exclude", "")
+    reveal_all = flask.request.args.get("reveal_all", "0") not in ("0", "false", "")
+    try:
+        limit = int(flask.request.args.get("limit", DEFAULT_MATCH_LIMIT))
+    except ValueError:
+        return flask.jsonify({"error": "limit must be an integer"}), 400
+    if not 0 <= limit <= MAX_MATCH_LIMIT:
+        return flask.jsonify({"error": f"limit must be between 0 and {MAX_MATCH_LIMIT}"}), 400
+
+    language = flask.request.args.get("language", "English")
+    try:
+        index = get_index(language)
+    except KeyError:
+        return flask.jsonify({"error": f"unknown language or dictionary {language!r}"}), 400
+    count, matches = index.match(pattern, exclude, reveal_all=reveal_all, limit=limit)
+    return flask.jsonify({"count": count, "words": matches})
+
+
 def main():
     root = tk.Tk()
     app = HangmanGame(root)
@@ -0,0 +1,314 @@
+"""
+Headless game sessions for the web API
+Mirrors the rules of HangmanGame without any Tkinter widgets, so bots and
+scripted clients can play over HTTP
+"""
+
+import json
+import os
+import random
+import string
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from words import get_words
+
+# fcntl is only needed to serialise leaderboard writes across worker processes
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+LEADERBOARD_FILE = os.environ.get('HANGMAN_LEADERBOARD_FILE', 'leaderboard.json')
+# When set, every leaderboard write appends "timestamp pid wait_s write_s" here
+LEADERBOARD_TIMING_LOG = os.environ.get('HANGMAN_LEADERBOARD_TIMING_LOG')
+MAX_WRONG_GUESSES = 6
+MAX_HINTS = 3
+VALID_LETTERS = frozenset(string.ascii_uppercase)
+FINISHED_SESSION_TTL = 300  # seconds a finished game stays readable
+IDLE_SESSION_TTL = 3600     # seconds before an abandoned game is dropped
+SWEEP_INTERVAL = 60
+
+_leaderboard_lock = threading.Lock()
+
+
+def _empty_leaderboard():
+    return {'games_won': 0, 'games_lost': 0, 'total_games': 0}
+
+
+def load_leaderboard():
+    """Load leaderboard from JSON file"""
+    try:
+        with open(LEADERBOARD_FILE, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return _empty_leaderboard()
+    except json.JSONDecodeError as e:
+        print(f"Leaderboard file is corrupt, starting from zero: {e}")
+        return _empty_leaderboard()
+
+
+def save_leaderboard(leaderboard):
+    """Save leaderboard atomically so readers never see a partial file"""
+    directory = os.path.dirname(os.path.abspath(LEADERBOARD_FILE))
+    fd, temp_path = tempfile.mkstemp(prefix='.leaderboard-', suffix='.json', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(leaderboard, f, indent=4)
+        os.replace(temp_path, LEADERBOARD_FILE)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class _LeaderboardFileLock:
+    """Exclusive lock shared by every process writing the leaderboard"""
+
+    def __enter__(self):
+        _leaderboard_lock.acquire()
+        self._file = None
+        if fcntl is not None:
+            try:
+                self._file = open(LEADERBOARD_FILE + '.lock', 'a')
+                fcntl.flock(self._file, fcntl.LOCK_EX)
+            except BaseException:
+                self.__exit__(None, None, None)
+                raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._file is not None:
+            self._file.close()  # closing releases the flock
+        _leaderboard_lock.release()
+
+
+def record_game_result(won):
+    """Add one finished game to the leaderboard"""
+    start = time.perf_counter()
+    with _LeaderboardFileLock():
+        locked = time.perf_counter()
+        leaderboard = load_leaderboard()
+        leaderboard['games_won' if won else 'games_lost'] += 1
+        leaderboard['total_games'] += 1
+        save_leaderboard(leaderboard)
+        written = time.perf_counter()
+    if LEADERBOARD_TIMING_LOG:
+        _log_leaderboard_timing(locked - start, written - locked)
+    return leaderboard
+
+
+def _log_leaderboard_timing(wait, write):
+    """Append one timing line; small O_APPEND writes from many workers do not interleave"""
+    try:
+        with open(LEADERBOARD_TIMING_LOG, 'a') as f:
+            f.write(f"{time.time():.6f} {os.getpid()} {wait:.6f} {write:.6f}\n")
+    except OSError as e:
+        print(f"Failed to write leaderboard timing: {e}")
+
+
+class GameSession:
+    """State of a single game played through the API"""
+
+    def __init__(self, word, difficulty="Medium", language="English"):
+        self.word = word.upper()
+        self.guessed_letters = set()
+        self.wrong_guesses = 0
+        self.max_wrong_guesses = MAX_WRONG_GUESSES
+        self.hints_remaining = MAX_HINTS
+        self.difficulty = difficulty
+        self.language = language
+        self.game_active = True
+        self.recorded = False
+        self.finished_at = None
+        self.last_active = time.monotonic()
+        self.on_finish = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def new_random(cls, language="English", difficulty="Medium"):
+        """Start a session with a random word from the word banks"""
+        return cls(random.choice(get_words(language, difficulty)), difficulty, language)
+
+    @property
+    def won(self):
+        return all(letter in self.guessed_letters for letter in self.word)
+
+    @property
+    def lost(self):
+        return self.wrong_guesses >= self.max_wrong_guesses
+
+    def masked_word(self):
+        """Word with unguessed letters replaced by underscores"""
+        return " ".join(letter if letter in self.guessed_letters else "_" for letter in self.word)
+
+    def guess(self, letter):
+        """Apply a letter guess and return the step result"""
+        if isinstance(letter, str):
+            letter = letter.upper()
+        if not self.game_active:
+            return self._result("guess", letter, "game_over")
+        if not isinstance(letter, str) or letter not in VALID_LETTERS:
+            return self._result("guess", letter, "invalid")
+        if letter in self.guessed_letters:
+            return self._result("guess", letter, "repeat")
+
+        self.guessed_letters.add(letter)
+        if letter in self.word:
+            outcome = "correct"
+        else:
+            self.wrong_guesses += 1
+            outcome = "wrong"
+        self.game_active = not (self.won or self.lost)
+        return self._result("guess", letter, outcome)
+
+    def hint(self):
+        """Reveal a random unguessed letter, as HangmanGame.use_hint does"""
+        if not self.game_active:
+            return self._result("hint", None, "game_over")
+        if self.hints_remaining <= 0:
+            return self._result("hint", None, "no_hints")
+
+        unguessed = [l for l in set(self.word) if l not in self.guessed_letters]
+        hint_letter = random.choice(unguessed)
+        self.hints_remaining -= 1
+        result = self.guess(hint_letter)
+        result["action"] = "hint"
+        return result
+
+    def apply_steps(self, steps):
+        """
+        Apply an ordered list of steps, stopping once the game is over.
+        A step is a letter string, {"guess": "A"} or {"hint": true}.
+        """
+        results = []
+        for step in steps:
+            if not self.game_active:
+                break
+            if isinstance(step, dict) and step.get("hint"):
+                results.append(self.hint())
+            elif isinstance(step, dict):
+                results.append(self.guess(step.get("guess", "")))
+            else:
+                results.append(self.guess(step))
+        return results
+
+    def to_dict(self):
+        """Public view of the session; the word is only shown once the game is over"""
+        state = {
+            "masked_word": self.masked_word(),
+            "guessed_letters": sorted(self.guessed_letters),
+            "wrong_guesses": self.wrong_guesses,
+            "max_wrong_guesses": self.max_wrong_guesses,
+            "hints_remaining": self.hints_remaining,
+            "difficulty": self.difficulty,
+            "language": self.language,
+            "game_active": self.game_active,
+            "won": self.won,
+        }
+        if not self.game_active:
+            state["word"] = self.word
+        return state
+
+    def _result(self, action, letter, outcome):
+        return {
+            "action": action,
+            "letter": letter,
+            "outcome": outcome,
+            "masked_word": self.masked_word(),
+            "wrong_guesses": self.wrong_guesses,
+            "hints_remaining": self.hints_remaining,
+        }
+
+
+class SessionStore:
+    """
+    Thread-safe in-memory registry of active sessions.
+    Finished games stay readable for finished_ttl seconds after they are
+    recorded, and games nobody has touched for idle_ttl seconds are dropped.
+    """
+
+    def __init__(self, finished_ttl=FINISHED_SESSION_TTL, idle_ttl=IDLE_SESSION_TTL):
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self.finished_ttl = finished_ttl
+        self.idle_ttl = idle_ttl
+        self._next_sweep = time.monotonic() + SWEEP_INTERVAL
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def create(self, session):
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._maybe_sweep()
+            self._sessions[session_id] = session
+        return session_id
+
+    def get(self, session_id):
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_active = time.monotonic()
+        return session
+
+    def snapshot(self):
+        """Shallow copy of {session id: session}"""
+        with self._lock:
+            return dict(self._sessions)
+
+    def load(self, sessions):
+        """Add sessions handed over from another worker"""
+        now = time.monotonic()
+        for session in sessions.values():
+            if session.recorded and session.finished_at is None:
+                session.finished_at = now
+        with self._lock:
+            self._sessions.update(sessions)
+
+    def finish(self, session):
+        """
+        Record a finished game exactly once, on the leaderboard or through
+        the session's on_finish callback (used by tournaments). The game is
+        only marked recorded after the write succeeds, so a failed write is
+        retried on the next request for that game.
+        """
+        with session.lock:
+            if session.game_active or session.recorded:
+                return False
+            if session.on_finish is not None:
+                session.on_finish(session)
+            else:
+                record_game_result(session.won)
+            session.recorded = True
+            session.finished_at = time.monotonic()
+        return True
+
+    def sweep(self, now=None):
+        """Drop expired finished and idle games, returning how many were removed"""
+        with self._lock:
+            return self._sweep(time.monotonic() if now is None else now)
+
+    def _maybe_sweep(self):
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+    def _sweep(self, now):
+        """The caller holds the lock"""
+        self._next_sweep = now + SWEEP_INTERVAL
+        finished_cutoff = now - self.finished_ttl
+        idle_cutoff = now - self.idle_ttl
+        expired = [
+            session_id for session_id, session in self._sessions.items()
+            if session.last_active <= idle_cutoff
+            or (session.recorded and session.finished_at is not None and session.finished_at <= finished_cutoff)
+        ]
+        for session_id in expired:
+            del self._sessions[session_id]
+        return len(expired)
@@ -0,0 +1,245 @@
+"""
+Compact binary snapshots of game sessions
+Each game packs into a fixed 32-byte record so a worker can hand its live
+games to another worker, or survive a restart, without JSON overhead.
+Tournaments live only in the worker that created them and are not handed
+off, so their games are skipped by dumps.
+"""
+
+import atexit
+import glob
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from words import WORD_BANKS
+from sessions import GameSession
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+LANGUAGES = list(WORD_BANKS.keys())
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+# flags, language, wrong guesses, hints left, guess mask, word id, inline word
+SNAPSHOT = struct.Struct("<BBBBIH22s")
+RECORD = struct.Struct("<16s" + SNAPSHOT.format[1:])
+# magic, record count, fingerprint of the word banks the word ids refer to
+HEADER = struct.Struct("<4sI8s")
+MAGIC = b"HGS2"
+
+MAX_INLINE_WORD = 22
+NO_WORD_ID = 0xFFFF
+
+FLAG_INLINE = 0x01
+FLAG_ACTIVE = 0x02
+FLAG_RECORDED = 0x04
+DIFFICULTY_SHIFT = 4
+
+_LETTER_BITS = {letter: 1 << i for i, letter in enumerate(LETTERS)}
+
+# Word ids are positions within get_words(language, difficulty), so they stay
+# valid only while the word banks are unchanged; other words are stored inline.
+# Dumps carry this fingerprint and are refused by workers with different banks.
+WORD_BANKS_FINGERPRINT = hashlib.sha256(json.dumps(WORD_BANKS).encode("utf-8")).digest()[:8]
+
+_WORD_IDS = {
+    (language, difficulty): {word.upper(): i for i, word in enumerate(words)}
+    for language, banks in WORD_BANKS.items()
+    for difficulty, words in banks.items()
+}
+
+
+def _locked_fields(session):
+    """
+    Encode a session while holding its lock, so a guess landing mid-dump
+    cannot produce a torn record. The caller must not already hold the lock.
+    """
+    lock = getattr(session, "lock", None)
+    if lock is None:
+        return _fields(session)
+    with lock:
+        return _fields(session)
+
+
+def _fields(session):
+    """Encode a session into the tuple of SNAPSHOT fields"""
+    if getattr(session, "on_finish", None) is not None:
+        # Restored without its callback it would be scored on the global leaderboard
+        raise ValueError("Tournament games cannot be snapshotted")
+    try:
+        language = LANGUAGES.index(session.language)
+        difficulty = DIFFICULTIES.index(session.difficulty)
+    except ValueError:
+        raise ValueError(f"Cannot snapshot {session.language}/{session.difficulty} game")
+
+    mask = 0
+    for letter in session.guessed_letters:
+        try:
+            mask |= _LETTER_BITS[letter]
+        except KeyError:
+            raise ValueError(f"Cannot snapshot guessed letter {letter!r}")
+
+    flags = difficulty << DIFFICULTY_SHIFT
+    if getattr(session, "game_active", True):
+        flags |= FLAG_ACTIVE
+    if getattr(session, "recorded", False):
+        flags |= FLAG_RECORDED
+
+    word_id = _WORD_IDS[(session.language, session.difficulty)].get(session.word, NO_WORD_ID)
+    inline = b""
+    if word_id == NO_WORD_ID:
+        flags |= FLAG_INLINE
+        inline = session.word.encode("ascii", errors="strict")
+        if len(inline) > MAX_INLINE_WORD:
+            raise ValueError(f"Word longer than {MAX_INLINE_WORD} letters cannot be snapshotted")
+
+    return flags, language, session.wrong_guesses, session.hints_remaining, mask, word_id, inline
+
+
+def _session(flags, language, wrong_guesses, hints_remaining, mask, word_id, inline):
+    """Rebuild a GameSession from SNAPSHOT fields"""
+    try:
+        language = LANGUAGES[language]
+        difficulty = DIFFICULTIES[flags >> DIFFICULTY_SHIFT]
+        if flags & FLAG_INLINE:
+            word = inline.rstrip(b"\0").decode("ascii")
+        else:
+            word = WORD_BANKS[language][difficulty][word_id]
+    except IndexError:
+        raise ValueError("Corrupt session snapshot record")
+    if not word.isalpha():
+        raise ValueError("Corrupt session snapshot record")
+
+    session = GameSession(word, difficulty, language)
+    session.guessed_letters = {letter for letter, bit in _LETTER_BITS.items() if mask & bit}
+    session.wrong_guesses = wrong_guesses
+    session.hints_remaining = hints_remaining
+    session.game_active = bool(flags & FLAG_ACTIVE)
+    session.recorded = bool(flags & FLAG_RECORDED)
+    return session
+
+
+def pack_session(session):
+    """Serialize one game (GameSession or HangmanGame) to 32 bytes"""
+    return SNAPSHOT.pack(*_locked_fields(session))
+
+
+def unpack_session(data):
+    """Deserialize a 32-byte snapshot into a GameSession"""
+    try:
+        fields = SNAPSHOT.unpack(data)
+    except struct.error as e:
+        raise ValueError(f"Corrupt session snapshot: {e}")
+    return _session(*fields)
+
+
+def dump_sessions(sessions):
+    """
+    Pack a {hex session id: session} mapping into one bytes blob.
+    Games that cannot be encoded are left out rather than failing the dump;
+    returns (data, {session id: reason} for the skipped games).
+    """
+    out = bytearray(HEADER.size + RECORD.size * len(sessions))
+    skipped = {}
+    offset = HEADER.size
+    for session_id, session in sessions.items():
+        try:
+            RECORD.pack_into(out, offset, bytes.fromhex(session_id), *_locked_fields(session))
+        except (ValueError, UnicodeEncodeError, struct.error) as e:
+            skipped[session_id] = str(e)
+            continue
+        offset += RECORD.size
+    HEADER.pack_into(out, 0, MAGIC, (offset - HEADER.size) // RECORD.size, WORD_BANKS_FINGERPRINT)
+    return bytes(out[:offset]), skipped
+
+
+def restore_sessions(data):
+    """
+    Unpack a blob from dump_sessions back into {hex session id: GameSession}.
+    Raises ValueError for corrupt dumps and for dumps made with other word banks.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Session snapshot dump is truncated")
+    magic, count, fingerprint = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a session snapshot dump")
+    if fingerprint != WORD_BANKS_FINGERPRINT:
+        raise ValueError("Session snapshot dump was made with different word banks")
+    body = memoryview(data)[HEADER.size:]
+    if len(body) != count * RECORD.size:
+        raise ValueError("Session snapshot dump is truncated")
+    return {
+        session_id.hex(): _session(*fields)
+        for session_id, *fields in RECORD.iter_unpack(body)
+    }
+
+
+def save_sessions(store, path):
+    """
+    Write every session in a SessionStore to a snapshot file,
+    returning {session id: reason} for games that were skipped
+    """
+    data, skipped = dump_sessions(store.snapshot())
+    fd, temp_path = tempfile.mkstemp(prefix='.sessions-', suffix='.tmp', dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return skipped
+
+
+def load_sessions(store, path):
+    """Load a snapshot file into a SessionStore, returning the number of games"""
+    with open(path, 'rb') as f:
+        sessions = restore_sessions(f.read())
+    store.load(sessions)
+    return len(sessions)
+
+
+def save_to_directory(store, directory):
+    """Save this worker's sessions as its own file in a shared snapshot directory"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"sessions-{os.getpid()}.bin")
+    skipped = save_sessions(store, path)
+    if skipped:
+        print(f"{len(skipped)} games could not be snapshotted")
+    return path
+
+
+def load_from_directory(store, directory):
+    """
+    Claim and load snapshot files left in a directory by earlier workers.
+    Each file is renamed before loading, so with several workers starting at
+    once every file is loaded by exactly one of them.
+    """
+    loaded = 0
+    for path in sorted(glob.glob(os.path.join(directory, "sessions-*.bin"))):
+        claimed = os.path.join(directory, f"claimed-{os.getpid()}-{os.path.basename(path)}")
+        try:
+            os.rename(path, claimed)
+        except OSError:
+            continue  # another worker got it first
+        try:
+            loaded += load_sessions(store, claimed)
+        except (OSError, ValueError) as e:
+            print(f"Could not restore sessions from {path}: {e}")
+            os.rename(claimed, os.path.join(directory, f"failed-{os.path.basename(path)}"))
+        else:
+            os.unlink(claimed)
+    return loaded
+
+
+def install_snapshot_hooks(store, variable="HANGMAN_SESSION_SNAPSHOT_DIR"):
+    """
+    If the environment variable names a directory, restore games saved there
+    and save this worker's games back when the process exits
+    """
+    directory = os.environ.get(variable)
+    if not directory:
+        return 0
+    loaded = load_from_directory(store, directory)
+    atexit.register(save_to_directory, store, directory)
+    return loaded
@@ -0,0 +1,158 @@
+import pytest
+
+pytest.importorskip("flask")
+
+import main
+import sessions
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(sessions, 'LEADERBOARD_FILE', str(tmp_path / 'leaderboard.json'))
+    return main.app.test_client()
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    calls = []
+    monkeypatch.setattr(sessions, 'record_game_result', calls.append)
+    return calls
+
+
+def new_game(client, word="cat"):
+    response = client.post('/api/games', json={"language": "English", "difficulty": "Easy"})
+    assert response.status_code == 201
+    game_id = response.get_json()["game_id"]
+    main.game_sessions.get(game_id).word = word.upper()
+    return game_id
+
+
+@pytest.mark.parametrize("body", [
+    {"language": "Klingon"},
+    {"difficulty": "Impossible"},
+    {"language": "Spanish", "difficulty": "Nightmare"},
+    {"language": ["x"]},
+    {"difficulty": {"a": 1}},
+])
+def test_new_game_rejects_unknown_word_bank(client, body):
+    assert client.post('/api/games', json=body).status_code == 400
+
+
+def test_new_game_uses_requested_bank(client):
+    response = client.post('/api/games', json={"language": "German", "difficulty": "Hard"})
+    state = response.get_json()
+    assert (state["language"], state["difficulty"]) == ("German", "Hard")
+
+
+@pytest.mark.parametrize("path", ['/api/games', '/api/games/{id}/guess', '/api/games/{id}/batch'])
+@pytest.mark.parametrize("body", [["E"], "E", 5])
+def test_non_object_bodies_are_rejected(client, path, body):
+    path = path.format(id=new_game(client))
+    assert client.post(path, json=body).status_code == 400
+
+
+@pytest.mark.parametrize("path", ['/api/games/nope', '/api/games/nope/guess', '/api/games/nope/hint', '/api/games/nope/batch'])
+def test_unknown_game_is_404(client, path):
+    method = client.get if path.count('/') == 3 else client.post
+    assert method(path, json={}).status_code == 404
+
+
+@pytest.mark.parametrize("steps", [None, "CAT", {"guess": "C"}])
+def test_batch_steps_must_be_a_list(client, steps):
+    response = client.post(f'/api/games/{new_game(client)}/batch', json={"steps": steps})
+    assert response.status_code == 400
+
+
+def test_batch_step_limit(client):
+    game_id = new_game(client)
+    response = client.post(f'/api/games/{game_id}/batch', json={"steps": ["Q"] * (main.MAX_BATCH_STEPS + 1)})
+    assert response.status_code == 400
+
+
+def test_batch_writes_leaderboard_once(client, writes):
+    game_id = new_game(client)
+    response = client.post(f'/api/games/{game_id}/batch', json={"steps": ["X", "C", {"guess": "A"}, "T", "Z"]})
+    body = response.get_json()
+    assert body["steps_applied"] == 4
+    assert body["state"]["won"] and body["state"]["word"] == "CAT"
+    assert writes == [True]
+
+    client.post(f'/api/games/{game_id}/batch', json={"steps": ["Q"]})
+    client.post(f'/api/games/{game_id}/guess', json={"letter": "Q"})
+    assert writes == [True]
+
+
+def test_single_guesses_write_once(client, writes):
+    game_id = new_game(client)
+    for letter in "BDEFGH":
+        client.post(f'/api/games/{game_id}/guess', json={"letter": letter})
+    state = client.get(f'/api/games/{game_id}').get_json()
+    assert not state["game_active"] and not state["won"]
+    assert writes == [False]
+
+
+def test_match_words_defaults_to_limited_results(client, monkeypatch):
+    monkeypatch.setattr(main, 'DEFAULT_MATCH_LIMIT', 2)
+    body = client.get('/api/words/match?pattern=____&language=English').get_json()
+    assert len(body["words"]) == 2 and body["count"] > 2
+
+
+@pytest.mark.parametrize("query", [
+    "pattern=____&limit=abc",
+    "pattern=____&limit=-1",
+    f"pattern=____&limit={10**6}",
+    "pattern=____&language=Klingon",
+    "pattern=",
+])
+def test_match_words_rejects_bad_queries(client, query):
+    assert client.get(f'/api/words/match?{query}').status_code == 400
+
+
+def test_match_words(client):
+    body = client.get('/api/words/match?pattern=G_____&exclude=ET&limit=10').get_json()
+    assert body == {"count": 1, "words": ["GALAXY"]}
+
+
+def new_tournament(client, **settings):
+    response = client.post('/api/tournaments', json={"rounds": 2, **settings})
+    assert response.status_code == 201
+    return response.get_json()["tournament_id"]
+
+
+@pytest.mark.parametrize("body", [
+    ["rounds"],
+    {"rounds": -1},
+    {"rounds": "x"},
+    {"rounds": 10**6},
+    {"time_limit": "abc"},
+    {"duration": 0},
+    {"language": "Klingon"},
+    {"difficulty": ["Hard"]},
+])
+def test_new_tournament_rejects_bad_settings(client, body):
+    assert client.post('/api/tournaments', json=body).status_code == 400
+
+
+@pytest.mark.parametrize("body", [{"player": ["a"]}, {"player": 7}, {"player": ""}, {"player": "x" * 65}, ["a"]])
+def test_join_rejects_bad_player_names(client, body):
+    tournament_id = new_tournament(client)
+    assert client.post(f'/api/tournaments/{tournament_id}/players', json=body).status_code == 400
+
+
+@pytest.mark.parametrize("top", ["0", "101", "abc"])
+def test_standings_top_is_capped(client, top):
+    tournament_id = new_tournament(client)
+    assert client.get(f'/api/tournaments/{tournament_id}/standings?top={top}').status_code == 400
+
+
+def test_tournament_round_trip(client, writes):
+    tournament_id = new_tournament(client, language="Spanish", difficulty="Easy")
+    assert client.post(f'/api/tournaments/{tournament_id}/players', json={"player": "ana"}).status_code == 201
+    game = client.post(f'/api/tournaments/{tournament_id}/players/ana/next').get_json()
+    assert game["language"] == "Spanish"
+    word = main.game_sessions.get(game["game_id"]).word
+    client.post(f'/api/games/{game["game_id"]}/batch', json={"steps": sorted(set(word))})
+
+    standings = client.get(f'/api/tournaments/{tournament_id}/standings?top=5').get_json()
+    assert standings["standings"][0]["player"] == "ana" and standings["standings"][0]["score"] > 0
+    assert writes == []
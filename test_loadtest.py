@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+import loadtest
+import sessions
+from sessions import GameSession
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert loadtest.percentile(values, 50) == 50
+    assert loadtest.percentile(values, 99) == 99
+    assert loadtest.percentile([7], 95) == 7
+    assert loadtest.percentile([], 50) == 0.0
+
+
+def test_recorder_merge():
+    a = loadtest.LatencyRecorder()
+    b = loadtest.LatencyRecorder()
+    a.record("guess", 0.1)
+    b.record("guess", 0.3, ok=False, not_found=True)
+    a.merge(b.export())
+    (row,) = a.report(1.0)
+    assert (row["count"], row["errors"], a.not_found) == (2, 1, 1)
+
+
+def test_timing_log_is_read_from_offset(tmp_path, monkeypatch):
+    log = tmp_path / "timing.log"
+    monkeypatch.setattr(sessions, 'LEADERBOARD_FILE', str(tmp_path / 'leaderboard.json'))
+    monkeypatch.setattr(sessions, 'LEADERBOARD_TIMING_LOG', str(log))
+    sessions.record_game_result(True)
+    offset = log.stat().st_size
+    sessions.record_game_result(False)
+    sessions.record_game_result(False)
+
+    recorder = loadtest.LatencyRecorder()
+    assert len(loadtest.read_timing_log(str(log), offset, recorder)) == 1
+    counts = {row["name"]: row["count"] for row in recorder.report(1.0)}
+    assert counts == {"leaderboard_wait": 2, "leaderboard_write": 2, "leaderboard_update": 2}
+
+
+class LostGamesClient:
+    """Starts games but forgets them, like a non-sticky multi-worker server"""
+
+    def post(self, path, payload=None):
+        if path == "/api/games":
+            return 201, {"game_id": "x", **GameSession("cat").to_dict()}
+        return 404, {"error": "unknown game"}
+
+
+def test_player_counts_lost_games():
+    recorder = loadtest.LatencyRecorder()
+    options = loadtest.parse_args(["--think-median", "0", "--games", "3"])
+    loadtest.SimulatedPlayer(LostGamesClient(), recorder, random.Random(1), options).run(float("inf"))
+    assert recorder.not_found == 3
+
+
+def test_in_process_run_reports_every_endpoint():
+    pytest.importorskip("flask")
+    options = loadtest.parse_args(["--players", "3", "--games", "2", "--think-median", "0",
+                                   "--hint-rate", "0.3", "--batch-rate", "0.3", "--seed", "1"])
+    elapsed, rows, notes = loadtest.run_load_test(options)
+    names = {row["name"] for row in rows}
+    assert {"start", "guess", "leaderboard_update", "leaderboard_wait"} <= names
+    assert all(row["errors"] == 0 for row in rows)
@@ -0,0 +1,116 @@
+import json
+import time
+
+import pytest
+
+import sessions
+from sessions import GameSession, SessionStore
+
+
+@pytest.fixture(autouse=True)
+def leaderboard_file(tmp_path, monkeypatch):
+    path = tmp_path / 'leaderboard.json'
+    monkeypatch.setattr(sessions, 'LEADERBOARD_FILE', str(path))
+    return path
+
+
+def test_batch_stops_at_game_over():
+    session = GameSession("cat")
+    results = session.apply_steps(["c", "a", "t", "x", "y"])
+    assert [r["letter"] for r in results] == ["C", "A", "T"]
+    assert not session.game_active and session.won
+
+
+def test_batch_stops_after_loss():
+    session = GameSession("cat")
+    results = session.apply_steps(list("BDEFGHIJ"))
+    assert len(results) == 6
+    assert session.lost and not session.game_active
+
+
+def test_hint_step_reveals_letter():
+    session = GameSession("cat")
+    result = session.apply_steps([{"hint": True}])[0]
+    assert result["action"] == "hint" and result["outcome"] == "correct"
+    assert session.hints_remaining == 2
+
+
+@pytest.mark.parametrize("step", ["É", "Ж", "1", "AB", ""])
+def test_non_ascii_letters_are_invalid(step):
+    session = GameSession("cat")
+    result = session.guess(step)
+    assert result["outcome"] == "invalid"
+    assert session.wrong_guesses == 0
+
+
+@pytest.mark.parametrize("step", [None, ["A"], 5])
+def test_non_string_steps_are_echoed_raw(step):
+    session = GameSession("cat")
+    result = session.apply_steps([{"guess": step}])[0]
+    assert result == {**result, "letter": step, "outcome": "invalid"}
+
+
+def test_finish_records_once(leaderboard_file):
+    store = SessionStore()
+    session = GameSession("cat")
+    store.create(session)
+    session.apply_steps(list("CAT"))
+    assert store.finish(session)
+    assert not store.finish(session)
+    assert json.loads(leaderboard_file.read_text()) == {'games_won': 1, 'games_lost': 0, 'total_games': 1}
+
+
+def test_failed_write_is_retried(monkeypatch):
+    store = SessionStore()
+    session = GameSession("cat")
+    session.apply_steps(list("CAT"))
+
+    record_game_result = sessions.record_game_result
+
+    def broken(won):
+        raise OSError("disk full")
+    monkeypatch.setattr(sessions, 'record_game_result', broken)
+    with pytest.raises(OSError):
+        store.finish(session)
+    assert not session.recorded
+
+    monkeypatch.setattr(sessions, 'record_game_result', record_game_result)
+    assert store.finish(session)
+
+
+def test_corrupt_leaderboard_is_not_fatal(leaderboard_file):
+    leaderboard_file.write_text('{"games_won": 1,')
+    assert sessions.record_game_result(True)['games_won'] == 1
+
+
+def test_sweep_drops_finished_and_idle_sessions():
+    store = SessionStore(finished_ttl=10, idle_ttl=100)
+    finished = GameSession("cat")
+    idle = GameSession("dog")
+    active = GameSession("fish")
+    ids = [store.create(s) for s in (finished, idle, active)]
+    finished.apply_steps(list("CAT"))
+    store.finish(finished)
+
+    now = time.monotonic()
+    idle.last_active = now - 200
+    assert store.sweep(now + 11) == 2
+    assert store.get(ids[2]) is active
+    assert store.get(ids[0]) is None and store.get(ids[1]) is None
+
+
+def _record_many(path, count):
+    sessions.LEADERBOARD_FILE = path
+    for _ in range(count):
+        sessions.record_game_result(True)
+
+
+def test_concurrent_processes_do_not_lose_updates(leaderboard_file):
+    import multiprocessing
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_record_many, args=(str(leaderboard_file), 25)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert json.loads(leaderboard_file.read_text())['total_games'] == 100
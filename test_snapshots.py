@@ -0,0 +1,139 @@
+import threading
+
+import pytest
+
+from sessions import GameSession, SessionStore
+from snapshots import (
+    SNAPSHOT, dump_sessions, load_sessions, pack_session, restore_sessions,
+    save_sessions, unpack_session,
+)
+
+
+def assert_same_game(restored, session):
+    assert restored.to_dict() == session.to_dict()
+    assert restored.word == session.word
+    assert restored.recorded == session.recorded
+
+
+@pytest.mark.parametrize("word,difficulty,language,steps", [
+    ("python", "Medium", "English", ["P", "X", "Z", "Q", {"hint": True}]),
+    ("CUSTOMWORD", "Hard", "German", ["A", "B", "C"]),
+    ("cat", "Easy", "English", list("CAT")),
+    ("zebra", "Easy", "French", list("ABCDFGHIJK")),
+])
+def test_pack_round_trip(word, difficulty, language, steps):
+    session = GameSession(word, difficulty, language)
+    session.apply_steps(steps)
+    data = pack_session(session)
+    assert len(data) == SNAPSHOT.size == 32
+    assert_same_game(unpack_session(data), session)
+
+
+def test_every_letter_round_trips():
+    session = GameSession("python")
+    session.guessed_letters = set("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    assert unpack_session(pack_session(session)).guessed_letters == set("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+
+def test_bulk_dump_skips_games_that_cannot_be_encoded():
+    store = SessionStore()
+    good = GameSession("python")
+    good.guess("P")
+    good_id = store.create(good)
+    long_id = store.create(GameSession("a" * 30))
+    odd = GameSession("cat")
+    odd.guessed_letters.add("É")
+    odd_id = store.create(odd)
+
+    data, skipped = dump_sessions(store.snapshot())
+    assert set(skipped) == {long_id, odd_id}
+    restored = restore_sessions(data)
+    assert list(restored) == [good_id]
+    assert_same_game(restored[good_id], good)
+
+
+def test_save_and_load_sessions(tmp_path):
+    store = SessionStore()
+    sessions = {store.create(GameSession.new_random()): None for _ in range(50)}
+    path = tmp_path / "sessions.bin"
+    assert save_sessions(store, str(path)) == {}
+
+    other = SessionStore()
+    assert load_sessions(other, str(path)) == 50
+    for session_id in sessions:
+        assert_same_game(other.get(session_id), store.get(session_id))
+
+
+def test_dump_waits_for_session_lock():
+    session = GameSession("python")
+    store = SessionStore()
+    store.create(session)
+    result = []
+    with session.lock:
+        worker = threading.Thread(target=lambda: result.append(dump_sessions(store.snapshot())))
+        worker.start()
+        worker.join(0.05)
+        assert worker.is_alive()
+        session.guess("P")
+    worker.join()
+    (restored,) = restore_sessions(result[0][0]).values()
+    assert restored.guessed_letters == {"P"}
+
+
+def test_truncated_dump_is_rejected():
+    store = SessionStore()
+    store.create(GameSession("cat"))
+    data, _ = dump_sessions(store.snapshot())
+    with pytest.raises(ValueError):
+        restore_sessions(data[:-1])
+
+
+def test_dump_from_other_word_banks_is_rejected(monkeypatch):
+    import snapshots
+    store = SessionStore()
+    store.create(GameSession("python"))
+    data, _ = dump_sessions(store.snapshot())
+    monkeypatch.setattr(snapshots, 'WORD_BANKS_FINGERPRINT', b"\0" * 8)
+    with pytest.raises(ValueError, match="word banks"):
+        restore_sessions(data)
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda data: data[:5],
+    lambda data: data[:33] + bytes([200]) + data[34:],         # language index out of range
+    lambda data: data[:32] + bytes([0x32]) + data[33:],        # difficulty index out of range
+    lambda data: data[:40] + b"\xfe\xff" + data[42:],          # word id out of range
+    lambda data: data[:32] + bytes([0x13]) + data[33:],        # inline flag over an empty word
+])
+def test_corrupt_dump_raises_value_error(corrupt):
+    # header is 16 bytes, then a 16-byte session id, flags at 32, language at 33, word id at 40
+    store = SessionStore()
+    store.create(GameSession("python"))
+    data, _ = dump_sessions(store.snapshot())
+    with pytest.raises(ValueError):
+        restore_sessions(corrupt(data))
+
+
+def test_corrupt_single_snapshot_raises_value_error():
+    with pytest.raises(ValueError):
+        unpack_session(b"short")
+
+
+def test_directory_handoff_between_workers(tmp_path):
+    from snapshots import load_from_directory, save_to_directory
+    old = SessionStore()
+    ids = [old.create(GameSession.new_random()) for _ in range(5)]
+    save_to_directory(old, str(tmp_path))
+
+    first, second = SessionStore(), SessionStore()
+    assert load_from_directory(first, str(tmp_path)) == 5
+    assert load_from_directory(second, str(tmp_path)) == 0
+    assert [first.get(i).word for i in ids] == [old.get(i).word for i in ids]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unreadable_snapshot_file_is_set_aside(tmp_path):
+    from snapshots import load_from_directory
+    (tmp_path / "sessions-1.bin").write_bytes(b"garbage")
+    assert load_from_directory(SessionStore(), str(tmp_path)) == 0
+    assert [p.name for p in tmp_path.iterdir()] == ["failed-sessions-1.bin"]
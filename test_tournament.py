@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from sessions import GameSession, SessionStore
+from snapshots import dump_sessions
+from tournament import MAX_ROUNDS, MAX_WORD_SCORE, Standings, Tournament, score_word
+
+
+def brute_rank(scores, player):
+    return 1 + sum(score > scores[player] for score in scores.values())
+
+
+def test_standings_match_brute_force():
+    rng = random.Random(7)
+    standings = Standings(500)
+    scores = {}
+    for step in range(5000):
+        player = rng.randrange(200)
+        scores[player] = rng.randrange(0, 501, 25)  # coarse scores force ties
+        standings.update(player, scores[player])
+        if step % 250 == 0:
+            top = standings.top(15)
+            assert [score for _, _, score in top] == sorted(scores.values(), reverse=True)[:15]
+            for rank, player, score in top:
+                assert rank == brute_rank(scores, player) == standings.rank(player)
+            probe = rng.choice(list(scores))
+            assert standings.rank(probe) == brute_rank(scores, probe)
+
+
+def test_ties_share_rank_in_arrival_order():
+    standings = Standings(100)
+    for player, score in [("a", 50), ("b", 80), ("c", 50), ("d", 10)]:
+        standings.update(player, score)
+    assert standings.top(10) == [(1, "b", 80), (2, "a", 50), (2, "c", 50), (4, "d", 10)]
+    standings.update("a", 60)
+    assert standings.top(2) == [(1, "b", 80), (2, "a", 60)]
+    assert standings.rank("c") == 3
+
+
+def test_score_word():
+    assert score_word(False, 1, 0, 0) == 0
+    assert score_word(True, 0, 0, 0) == MAX_WORD_SCORE
+    assert score_word(True, 10.9, 2, 1) == MAX_WORD_SCORE - 50 - 150 - 100
+    assert score_word(True, 10_000, 5, 3) > 0
+
+
+@pytest.mark.parametrize("rounds,time_limit", [
+    (0, 60), (-1, 60), (MAX_ROUNDS + 1, 60), (5, 0), (5, -1), (5, float("nan")), (5, float("inf")),
+])
+def test_invalid_settings_are_rejected(rounds, time_limit):
+    with pytest.raises(ValueError):
+        Tournament(rounds=rounds, time_limit=time_limit)
+
+
+def test_finished_words_update_standings_not_leaderboard(monkeypatch):
+    import sessions
+    monkeypatch.setattr(sessions, 'record_game_result', lambda won: pytest.fail("leaderboard written"))
+    tournament = Tournament(rounds=2, seed=1)
+    store = SessionStore()
+    for name in ("solver", "loser"):
+        tournament.join(name)
+        for _ in range(2):
+            session = tournament.start_round(name)
+            store.create(session)
+            letters = sorted(set(session.word)) if name == "solver" else list("QZXJVKW")
+            session.apply_steps(letters)
+            store.finish(session)
+
+    board = tournament.leaderboard()
+    assert [row["player"] for row in board] == ["solver", "loser"]
+    assert board[1]["score"] == 0
+    assert tournament.player_status("solver")["round"] == 2
+
+
+def test_tournament_games_are_not_snapshotted():
+    tournament = Tournament(rounds=1)
+    tournament.join("p")
+    store = SessionStore()
+    session_id = store.create(tournament.start_round("p"))
+    regular_id = store.create(GameSession("cat"))
+    _, skipped = dump_sessions(store.snapshot())
+    assert list(skipped) == [session_id]
+    assert regular_id not in skipped
+
+
+def test_ended_tournament_refuses_new_play():
+    tournament = Tournament(rounds=2, duration=60)
+    tournament.join("early")
+    tournament.ends_at = 0
+    with pytest.raises(ValueError, match="ended"):
+        tournament.join("late")
+    with pytest.raises(ValueError, match="ended"):
+        tournament.start_round("early")
+    assert tournament.leaderboard() == [{"rank": 1, "player": "early", "score": 0}]
+
+
+def test_store_drops_expired_tournaments():
+    from tournament import TournamentStore
+    store = TournamentStore(results_ttl=100)
+    old, current = Tournament(rounds=1, duration=10), Tournament(rounds=1, duration=1000)
+    old_id, current_id = store.create(old), store.create(current)
+    assert store.sweep(old.ends_at + 101) == 1
+    assert store.get(old_id) is None and store.get(current_id) is current
@@ -0,0 +1,54 @@
+import pytest
+
+from word_index import PatternIndex, get_index, load_dictionary
+
+WORDS = ["planet", "banana", "galaxy", "salami", "bottle", "cat", "cab", "bob"]
+
+
+def brute_force(pattern, exclude=(), reveal_all=False):
+    exclude = {l.upper() for l in exclude}
+    shown = {l for l in pattern if l != "_"}
+    matches = []
+    for word in sorted(w.upper() for w in WORDS):
+        if len(word) != len(pattern) or exclude & set(word):
+            continue
+        if all(p == "_" and (not reveal_all or w not in shown) or p == w for p, w in zip(pattern, word)):
+            matches.append(word)
+    return matches
+
+
+@pytest.mark.parametrize("pattern,exclude,reveal_all", [
+    ("_A_A_A", "", False),
+    ("_A____", "NT", False),
+    ("______", "E", False),
+    ("B_B", "", False),
+    ("B__", "", True),
+    ("CA_", "T", False),
+    ("Q_____", "", False),
+])
+def test_query_matches_brute_force(pattern, exclude, reveal_all):
+    index = PatternIndex(WORDS)
+    assert index.query(pattern, exclude, reveal_all) == brute_force(pattern, exclude, reveal_all)
+    assert index.count(pattern, exclude, reveal_all) == len(brute_force(pattern, exclude, reveal_all))
+
+
+def test_match_counts_beyond_limit():
+    index = PatternIndex(WORDS)
+    assert index.match("______", limit=2) == (5, ["BANANA", "BOTTLE"])
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_non_positive_limit_returns_nothing(limit):
+    assert PatternIndex(WORDS).query("______", limit=limit) == []
+
+
+def test_unknown_language_raises():
+    with pytest.raises(KeyError):
+        get_index("Klingon")
+
+
+def test_loaded_dictionary_is_registered(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("alpha\nbeta\nnot-a-word\n")
+    load_dictionary("test-dict", str(path))
+    assert get_index("test-dict").query("B___") == ["BETA"]
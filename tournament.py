@@ -0,0 +1,279 @@
+"""
+Timed tournament mode
+Every player solves the same sequence of words against the clock and
+standings are updated incrementally as each game finishes
+"""
+
+import math
+import random
+import threading
+import time
+import uuid
+from words import get_words
+from sessions import GameSession, MAX_HINTS
+
+MAX_WORD_SCORE = 1000
+MIN_SOLVED_SCORE = 100
+TIME_PENALTY = 5        # points per second taken
+WRONG_PENALTY = 75      # points per wrong guess
+HINT_PENALTY = 100      # points per hint used
+MAX_ROUNDS = 100
+JOIN_WINDOW = 3600              # seconds added to rounds * time_limit by default
+MAX_DURATION = 7 * 24 * 3600
+RESULTS_TTL = 24 * 3600         # how long standings stay readable after the end
+SWEEP_INTERVAL = 60
+
+
+def score_word(solved, seconds, wrong_guesses, hints_used):
+    """Points for one word; any solve is worth more than a miss"""
+    if not solved:
+        return 0
+    score = MAX_WORD_SCORE - TIME_PENALTY * int(seconds) - WRONG_PENALTY * wrong_guesses - HINT_PENALTY * hints_used
+    return max(MIN_SOLVED_SCORE, score)
+
+
+class Standings:
+    """
+    Order-statistic view of player totals.
+    A Fenwick tree counts players per total score, so updating a player and
+    looking up a rank are O(log S) for S possible totals. Players with the
+    same total are kept in the order they reached it.
+    """
+
+    def __init__(self, max_score):
+        self.max_score = max_score
+        self._tree = [0] * (max_score + 2)
+        self._buckets = {}
+        self._scores = {}
+
+    def __len__(self):
+        return len(self._scores)
+
+    def _add(self, score, delta):
+        i = score + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _count_at_most(self, score):
+        i = score + 1
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _kth_smallest(self, k):
+        """Score held by the k-th lowest player (1-based)"""
+        pos = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(self._tree) and self._tree[nxt] < k:
+                pos = nxt
+                k -= self._tree[nxt]
+            step >>= 1
+        return pos
+
+    def update(self, player, score):
+        """Set a player's total score"""
+        score = min(max(0, score), self.max_score)
+        old = self._scores.get(player)
+        if old == score:
+            return
+        if old is not None:
+            self._add(old, -1)
+            bucket = self._buckets[old]
+            del bucket[player]
+            if not bucket:
+                del self._buckets[old]
+        self._add(score, 1)
+        self._buckets.setdefault(score, {})[player] = None
+        self._scores[player] = score
+
+    def rank(self, player):
+        """1-based rank of a player, ties share the best rank"""
+        score = self._scores.get(player)
+        if score is None:
+            return None
+        return len(self._scores) - self._count_at_most(score) + 1
+
+    def top(self, n=10):
+        """The n best players as (rank, player, score) tuples"""
+        board = []
+        count = len(self._scores)
+        k = 1
+        while k <= count and len(board) < n:
+            score = self._kth_smallest(count - k + 1)
+            for player in self._buckets[score]:
+                board.append((k, player, score))
+                if len(board) >= n:
+                    break
+            k += len(self._buckets[score])
+        return board
+
+
+class PlayerProgress:
+    """A player's position in the word sequence"""
+
+    def __init__(self, name):
+        self.name = name
+        self.round = 0
+        self.total = 0
+        self.session = None
+        self.started_at = None
+        self.results = []
+
+
+class Tournament:
+    """A fixed word sequence shared by every player"""
+
+    def __init__(self, language="English", difficulty="Medium", rounds=5, time_limit=120, seed=None, duration=None):
+        if not 1 <= rounds <= MAX_ROUNDS:
+            raise ValueError(f"rounds must be between 1 and {MAX_ROUNDS}")
+        if not (math.isfinite(time_limit) and time_limit > 0):
+            raise ValueError("time_limit must be a positive number of seconds")
+        if duration is None:
+            duration = min(rounds * time_limit + JOIN_WINDOW, MAX_DURATION)
+        if not (math.isfinite(duration) and 0 < duration <= MAX_DURATION):
+            raise ValueError(f"duration must be between 0 and {MAX_DURATION} seconds")
+        words = get_words(language, difficulty)
+        rng = random.Random(seed)
+        if rounds <= len(words):
+            self.words = rng.sample(words, rounds)
+        else:
+            self.words = [rng.choice(words) for _ in range(rounds)]
+        self.language = language
+        self.difficulty = difficulty
+        self.time_limit = time_limit
+        self.players = {}
+        self.standings = Standings(MAX_WORD_SCORE * rounds)
+        self.ends_at = time.monotonic() + duration
+        self._lock = threading.Lock()
+
+    @property
+    def ended(self):
+        return time.monotonic() >= self.ends_at
+
+    def join(self, name):
+        with self._lock:
+            if self.ended:
+                raise ValueError("Tournament has ended")
+            if name in self.players:
+                raise ValueError(f"Player {name!r} already joined")
+            self.players[name] = PlayerProgress(name)
+            self.standings.update(name, 0)
+
+    def start_round(self, name):
+        """Start the player's next word and return its GameSession"""
+        with self._lock:
+            progress = self.players.get(name)
+            if progress is None:
+                raise KeyError(name)
+            current = progress.session
+            if current is not None and current.game_active:
+                if time.monotonic() - progress.started_at <= self.time_limit:
+                    raise ValueError("Current word is not finished yet")
+                # Out of time: the word is forfeited and the player moves on
+                current.game_active = False
+                current.recorded = True
+                self._score_round(progress, current)
+            if progress.round >= len(self.words):
+                raise ValueError("No words left in this tournament")
+            if self.ended:
+                raise ValueError("Tournament has ended")
+
+            session = GameSession(self.words[progress.round], self.difficulty, self.language)
+            session.on_finish = lambda finished: self.finish_round(name, finished)
+            progress.session = session
+            progress.started_at = time.monotonic()
+            return session
+
+    def finish_round(self, name, session):
+        """Score a finished word and move the player up or down the standings"""
+        with self._lock:
+            progress = self.players[name]
+            if session is not progress.session:
+                return None
+            return self._score_round(progress, session)
+
+    def _score_round(self, progress, session):
+        """Record the result of the current word; the caller holds the lock"""
+        seconds = time.monotonic() - progress.started_at
+        solved = session.won and seconds <= self.time_limit
+        score = score_word(solved, seconds, session.wrong_guesses, MAX_HINTS - session.hints_remaining)
+        progress.results.append({
+            "word": session.word,
+            "solved": solved,
+            "seconds": round(seconds, 3),
+            "wrong_guesses": session.wrong_guesses,
+            "score": score,
+        })
+        progress.round += 1
+        progress.total += score
+        progress.session = None
+        self.standings.update(progress.name, progress.total)
+        return score
+
+    def player_status(self, name):
+        with self._lock:
+            progress = self.players[name]
+            return {
+                "player": name,
+                "round": progress.round,
+                "rounds": len(self.words),
+                "total": progress.total,
+                "rank": self.standings.rank(name),
+                "results": list(progress.results),
+            }
+
+    def leaderboard(self, n=10):
+        with self._lock:
+            return [
+                {"rank": rank, "player": player, "score": score}
+                for rank, player, score in self.standings.top(n)
+            ]
+
+
+class TournamentStore:
+    """
+    Thread-safe registry of tournaments. Standings stay readable for
+    results_ttl seconds after a tournament ends and are then dropped.
+    """
+
+    def __init__(self, results_ttl=RESULTS_TTL):
+        self._tournaments = {}
+        self._lock = threading.Lock()
+        self.results_ttl = results_ttl
+        self._next_sweep = time.monotonic() + SWEEP_INTERVAL
+
+    def __len__(self):
+        with self._lock:
+            return len(self._tournaments)
+
+    def create(self, tournament):
+        tournament_id = uuid.uuid4().hex
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._next_sweep:
+                self._sweep(now)
+            self._tournaments[tournament_id] = tournament
+        return tournament_id
+
+    def get(self, tournament_id):
+        with self._lock:
+            return self._tournaments.get(tournament_id)
+
+    def sweep(self, now=None):
+        """Drop tournaments whose results have expired, returning how many were removed"""
+        with self._lock:
+            return self._sweep(time.monotonic() if now is None else now)
+
+    def _sweep(self, now):
+        """The caller holds the lock"""
+        self._next_sweep = now + SWEEP_INTERVAL
+        cutoff = now - self.results_ttl
+        expired = [tid for tid, tournament in self._tournaments.items() if tournament.ends_at <= cutoff]
+        for tournament_id in expired:
+            del self._tournaments[tournament_id]
+        return len(expired)
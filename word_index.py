@@ -0,0 +1,178 @@
+"""
+Positional pattern index over the word banks
+Answers queries like "_ A _ _ A _ excluding E, T" by intersecting
+precomputed bitsets instead of scanning every word
+"""
+
+import os
+from words import WORD_BANKS
+
+BLANK = "_"
+
+
+def _to_bitset(word_ids, size):
+    """Pack a list of word ids into an int with those bits set"""
+    flags = bytearray(b"0" * size)
+    for word_id in word_ids:
+        flags[word_id] = 49  # ord("1")
+    return int(flags[::-1], 2) if size else 0
+
+
+class PatternIndex:
+    """
+    Words are grouped by length and numbered within each group.
+    For every group the index keeps one bitset (a Python int) per
+    (position, letter) pair and one per letter contained in the word,
+    so a query is a handful of AND operations over those bitsets.
+    """
+
+    def __init__(self, words):
+        self._words = {}
+        self._positions = {}
+        self._letters = {}
+        self._all = {}
+
+        seen = set()
+        for word in words:
+            word = word.strip().upper()
+            if not word or word in seen:
+                continue
+            seen.add(word)
+            self._words.setdefault(len(word), []).append(word)
+
+        for length, group in self._words.items():
+            group.sort()
+            positions = {}
+            letters = {}
+            for word_id, word in enumerate(group):
+                for pos, letter in enumerate(word):
+                    positions.setdefault((pos, letter), []).append(word_id)
+                for letter in set(word):
+                    letters.setdefault(letter, []).append(word_id)
+            size = len(group)
+            self._positions[length] = {key: _to_bitset(ids, size) for key, ids in positions.items()}
+            self._letters[length] = {key: _to_bitset(ids, size) for key, ids in letters.items()}
+            self._all[length] = (1 << size) - 1
+
+    @classmethod
+    def from_word_banks(cls, language="English"):
+        """Build an index over every difficulty of a language in WORD_BANKS"""
+        banks = WORD_BANKS.get(language, WORD_BANKS["English"])
+        return cls(word for words in banks.values() for word in words)
+
+    @classmethod
+    def from_file(cls, path, encoding="utf-8"):
+        """Build an index from a dictionary file with one word per line"""
+        with open(path, 'r', encoding=encoding) as f:
+            return cls(line for line in f if line.strip().isalpha())
+
+    def __len__(self):
+        return sum(len(group) for group in self._words.values())
+
+    def _match_bits(self, pattern, exclude, reveal_all):
+        pattern = pattern.replace(" ", "").upper()
+        length = len(pattern)
+        if length not in self._words:
+            return length, 0
+
+        positions = self._positions[length]
+        letters = self._letters[length]
+        everything = self._all[length]
+        bits = everything
+
+        revealed = set()
+        for pos, letter in enumerate(pattern):
+            if letter == BLANK:
+                continue
+            revealed.add(letter)
+            bits &= positions.get((pos, letter), 0)
+            if not bits:
+                return length, 0
+
+        for letter in {l.upper() for l in exclude}:
+            bits &= everything ^ letters.get(letter, 0)
+
+        if reveal_all:
+            # In hangman a revealed letter shows every occurrence, so blanks
+            # can never hold a letter that already appears in the pattern
+            for pos, letter in enumerate(pattern):
+                if letter != BLANK:
+                    continue
+                for shown in revealed:
+                    bits &= everything ^ positions.get((pos, shown), 0)
+
+        return length, bits
+
+    def count(self, pattern, exclude=(), reveal_all=False):
+        """Number of words matching the pattern"""
+        _, bits = self._match_bits(pattern, exclude, reveal_all)
+        return bits.bit_count()
+
+    def query(self, pattern, exclude=(), reveal_all=False, limit=None):
+        """
+        Return the words matching a pattern such as "_A__A_".
+        Underscores are unknown letters, exclude is an iterable of letters
+        that must not appear anywhere in the word.
+        """
+        return self.match(pattern, exclude, reveal_all, limit)[1]
+
+    def match(self, pattern, exclude=(), reveal_all=False, limit=None):
+        """Return (total number of matches, matching words up to limit)"""
+        length, bits = self._match_bits(pattern, exclude, reveal_all)
+        return bits.bit_count(), self._decode(length, bits, limit)
+
+    def _decode(self, length, bits, limit):
+        if not bits or (limit is not None and limit <= 0):
+            return []
+
+        group = self._words[length]
+        # Scanning the binary string is far faster than peeling bits off a
+        # large int one at a time
+        flags = bin(bits)[:1:-1]
+        matches = []
+        word_id = flags.find("1")
+        while word_id != -1:
+            matches.append(group[word_id])
+            if limit is not None and len(matches) >= limit:
+                break
+            word_id = flags.find("1", word_id + 1)
+        return matches
+
+
+_indexes = {}
+
+
+def register_index(name, index):
+    """Make an index (e.g. a loaded dictionary) available to get_index by name"""
+    _indexes[name] = index
+
+
+def load_dictionary(name, path, encoding="utf-8"):
+    """Index a dictionary file and register it under name"""
+    index = PatternIndex.from_file(path, encoding)
+    register_index(name, index)
+    return index
+
+
+def load_dictionaries_from_env(variable="HANGMAN_DICTIONARIES"):
+    """Load dictionaries listed as "name=path,name=path" in an environment variable"""
+    loaded = []
+    for entry in os.environ.get(variable, "").split(","):
+        if "=" not in entry:
+            continue
+        name, path = (part.strip() for part in entry.split("=", 1))
+        load_dictionary(name, path)
+        loaded.append(name)
+    return loaded
+
+
+def get_index(name="English"):
+    """
+    Get a registered index, building WORD_BANKS languages on first use.
+    Raises KeyError for unknown names.
+    """
+    if name not in _indexes:
+        if name not in WORD_BANKS:
+            raise KeyError(name)
+        _indexes[name] = PatternIndex.from_word_banks(name)
+    return _indexes[name]